@@ -1,205 +1,228 @@
+import argparse
 import unittest
+import io
 from unittest.mock import patch, mock_open, MagicMock
 import os
 import tempfile
 import yaml
 import re
-from pure_recipe import *
-
-from recipe_scrapers import scrape_me
-
+from pure_recipe import (
+    save_recipe_to_markdown,
+    view_recipe,
+    save_list_of_recipes,
+    browse_recipes,
+    load_yaml,
+    parse_arguments,
+)
+
+_TMP = tempfile.gettempdir()
+
+RECIPE_MD = (
+    "# Test Recipe\n"
+    "**Serves:** 4 servings\n"
+    "**Total Time:** 30 mins\n"
+    "\n"
+    "## Ingredients\n"
+    "- 1 cup flour\n"
+    "- 2 eggs\n"
+    "\n"
+    "## Instructions\n"
+    "1. Mix ingredients\n"
+    "2. Bake for 20 minutes"
+)
+
+_FILENAME_RE = re.compile(r"test-recipe-\d{4}\.md")
+
+_BASE_SCRAPER_ATTRS = {
+    "title": "Test Recipe",
+    "yields": "4 servings",
+    "total_time": 30,
+    "ingredients": ["1 cup flour", "2 eggs"],
+    "instructions_list": ["Mix ingredients", "Bake for 20 minutes"],
+}
+
+
+def _open_stringio(data: str) -> MagicMock:
+    """Build an open() replacement that returns a fresh StringIO over data on every call."""
+    opener = MagicMock()
+    opener.side_effect = lambda *args, **kwargs: io.StringIO(data)
+    return opener
+
+
+def _mock_scraper(**overrides) -> MagicMock:
+    """Build a mock scraper from the base attributes, overriding only what a test needs."""
+    scraper = MagicMock()
+    for name, value in {**_BASE_SCRAPER_ATTRS, **overrides}.items():
+        getattr(scraper, name).return_value = value
+    return scraper
+
+
+@patch('pure_recipe.scrape_me')
 class TestRecipeApp(unittest.TestCase):
 
-    @patch('pure_recipe.scrape_me')
-    def test_save_recipe_to_markdown(self, mock_scrape_me):
-        mock_scraper = MagicMock()
-        mock_scraper.title.return_value = "Test Recipe"
-        mock_scraper.yields.return_value = "4 servings"
-        mock_scraper.total_time.return_value = 30
-        mock_scraper.ingredients.return_value = ["1 cup flour", "2 eggs"]
-        mock_scraper.instructions_list.return_value = ["Mix ingredients", "Bake for 20 minutes"]
-        mock_scrape_me.return_value = mock_scraper
-
-        # Use a real temporary directory for actual file operations
-        with tempfile.TemporaryDirectory() as tmpdir:
-            settings = {"directory": tmpdir, "yield": True, "time": True}
-            recipe_url = "http://example.com/recipe"
+    # (ingredients, expected substrings, forbidden substrings) for save_recipe_to_markdown
+    SAVE_RECIPE_CASES = [
+        # Basic recipe rendering
+        (
+            ["1 cup flour", "2 eggs"],
+            [
+                "# Test Recipe",  # Clean title without dashes
+                "**Serves:** 4 servings",
+                "**Total Time:** 30 mins",
+                "- 1 cup flour",
+                "1. Mix ingredients",
+            ],
+            [],
+        ),
+        # Ingredients with (optional) are not wrapped in additional parentheses
+        (
+            ["1 cup flour", "2 eggs (optional)", "1 tsp salt"],
+            ["- 2 eggs (optional)"],
+            ["(2 eggs (optional))", "- (2 eggs (optional))"],
+        ),
+        # Double parentheses in ingredients are normalized to single parentheses
+        (
+            [
+                "⅛ tsp turmeric ((optional))",
+                "¼ tsp lemon zest ( (optional))",
+                "¼ tsp salt ((adjust to taste))",
+                "1 cup flour (normal)"
+            ],
+            [
+                "- ⅛ tsp turmeric (optional)",
+                "- ¼ tsp lemon zest (optional)",
+                "- ¼ tsp salt (adjust to taste)",
+                "- 1 cup flour (normal)",
+            ],
+            ["((optional))", "( (optional))", "((adjust to taste))"],
+        ),
+        # Whitespace inside parentheses is trimmed
+        (
+            [
+                "1 tbsp ginger (chopped or minced )",
+                "½ tbsp garlic (chopped or minced)",
+                "1 cup flour ( normal )"
+            ],
+            [
+                "- 1 tbsp ginger (chopped or minced)",
+                "- ½ tbsp garlic (chopped or minced)",
+                "- 1 cup flour (normal)",
+            ],
+            ["(chopped or minced )", "( normal )"],
+        ),
+    ]
+
+    @classmethod
+    def setUpClass(cls):
+        # One shared temporary root for the whole class; tests get their own subdirectory
+        cls._root = tempfile.TemporaryDirectory()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._root.cleanup()
+
+    def _make_tmpdir(self) -> str:
+        """Create a fresh subdirectory under the shared temporary root."""
+        return tempfile.mkdtemp(dir=self._root.name)
+
+    def _save_in_memory(self, recipe_url: str, settings: dict):
+        """
+        Run save_recipe_to_markdown with file writes captured in memory.
+
+        :return: (path returned by save_recipe_to_markdown, path passed to open, written content)
+        """
+        mocked_open = mock_open()
+        with patch('pure_recipe.open', mocked_open, create=True), \
+                patch('os.path.exists', return_value=True), \
+                patch('os.makedirs'):
             file_path = save_recipe_to_markdown(recipe_url, settings)
 
-            self.assertTrue(os.path.exists(file_path))
-            # Check filename pattern: test-recipe-XXXX.md where XXXX is 4-digit ID
-            filename = os.path.basename(file_path)
-            self.assertTrue(re.match(r"test-recipe-\d{4}\.md", filename), 
-                           f"Filename {filename} doesn't match expected pattern")
-            with open(file_path, "r") as f:
-                content = f.read()
-                self.assertIn("# Test Recipe", content)  # Clean title without dashes
-                self.assertIn("**Serves:** 4 servings", content)
-                self.assertIn("**Total Time:** 30 mins", content)
-                self.assertIn("- 1 cup flour", content)
-                self.assertIn("1. Mix ingredients", content)
-
-    @patch('pure_recipe.scrape_me')
-    def test_save_recipe_with_optional_ingredient(self, mock_scrape_me):
-        """Test that ingredients with (optional) are not wrapped in additional parentheses."""
-        mock_scraper = MagicMock()
-        mock_scraper.title.return_value = "Test Recipe"
-        mock_scraper.yields.return_value = "4 servings"
-        mock_scraper.total_time.return_value = 30
-        mock_scraper.ingredients.return_value = [
-            "1 cup flour",
-            "2 eggs (optional)",
-            "1 tsp salt"
-        ]
-        mock_scraper.instructions_list.return_value = ["Mix ingredients", "Bake for 20 minutes"]
-        mock_scrape_me.return_value = mock_scraper
-
-        # Use a real temporary directory for actual file operations
-        with tempfile.TemporaryDirectory() as tmpdir:
-            settings = {"directory": tmpdir, "yield": True, "time": True}
-            recipe_url = "http://example.com/recipe"
-            file_path = save_recipe_to_markdown(recipe_url, settings)
+        opened_path = mocked_open.call_args[0][0]
+        handle = mocked_open.return_value
+        content = "".join(call.args[0] for call in handle.write.call_args_list)
+        return file_path, opened_path, content
 
-            self.assertTrue(os.path.exists(file_path))
-            with open(file_path, "r") as f:
-                content = f.read()
-                # Check that optional ingredient is printed correctly without extra parentheses
-                self.assertIn("- 2 eggs (optional)", content)
-                # Ensure it's not wrapped in additional parentheses
-                self.assertNotIn("(2 eggs (optional))", content)
-                self.assertNotIn("- (2 eggs (optional))", content)
-
-    @patch('pure_recipe.scrape_me')
-    def test_normalize_double_parentheses(self, mock_scrape_me):
-        """Test that double parentheses in ingredients are normalized to single parentheses."""
-        mock_scraper = MagicMock()
-        mock_scraper.title.return_value = "Test Recipe"
-        mock_scraper.yields.return_value = "4 servings"
-        mock_scraper.total_time.return_value = 30
-        mock_scraper.ingredients.return_value = [
-            "⅛ tsp turmeric ((optional))",
-            "¼ tsp lemon zest ( (optional))",
-            "¼ tsp salt ((adjust to taste))",
-            "1 cup flour (normal)"
-        ]
-        mock_scraper.instructions_list.return_value = ["Mix ingredients"]
+    def test_save_recipe_to_markdown(self, mock_scrape_me):
+        mock_scraper = _mock_scraper()
         mock_scrape_me.return_value = mock_scraper
 
-        # Use a real temporary directory for actual file operations
-        with tempfile.TemporaryDirectory() as tmpdir:
-            settings = {"directory": tmpdir, "yield": True, "time": True}
-            recipe_url = "http://example.com/recipe"
-            file_path = save_recipe_to_markdown(recipe_url, settings)
+        # Capture the rendered markdown in memory instead of writing to disk
+        settings = {"directory": "recipes", "yield": True, "time": True}
+        recipe_url = "http://example.com/recipe"
 
-            self.assertTrue(os.path.exists(file_path))
-            with open(file_path, "r") as f:
-                content = f.read()
-                # Check that double parentheses are normalized
-                self.assertIn("- ⅛ tsp turmeric (optional)", content)
-                self.assertIn("- ¼ tsp lemon zest (optional)", content)
-                self.assertIn("- ¼ tsp salt (adjust to taste)", content)
-                self.assertIn("- 1 cup flour (normal)", content)
-                # Ensure double parentheses are not present
-                self.assertNotIn("((optional))", content)
-                self.assertNotIn("( (optional))", content)
-                self.assertNotIn("((adjust to taste))", content)
-
-    @patch('pure_recipe.scrape_me')
-    def test_trim_whitespace_in_parentheses(self, mock_scrape_me):
-        """Test that whitespace inside parentheses is trimmed."""
-        mock_scraper = MagicMock()
-        mock_scraper.title.return_value = "Test Recipe"
-        mock_scraper.yields.return_value = "4 servings"
-        mock_scraper.total_time.return_value = 30
-        mock_scraper.ingredients.return_value = [
-            "1 tbsp ginger (chopped or minced )",
-            "½ tbsp garlic (chopped or minced)",
-            "1 cup flour ( normal )"
-        ]
-        mock_scraper.instructions_list.return_value = ["Mix ingredients"]
-        mock_scrape_me.return_value = mock_scraper
+        for i, (ingredients, expected, forbidden) in enumerate(self.SAVE_RECIPE_CASES):
+            with self.subTest(i=i):
+                mock_scraper.ingredients.return_value = ingredients
+                file_path, opened_path, content = self._save_in_memory(recipe_url, settings)
 
-        # Use a real temporary directory for actual file operations
-        with tempfile.TemporaryDirectory() as tmpdir:
-            settings = {"directory": tmpdir, "yield": True, "time": True}
-            recipe_url = "http://example.com/recipe"
-            file_path = save_recipe_to_markdown(recipe_url, settings)
+                self.assertEqual(file_path, opened_path)
+                # Check filename pattern: test-recipe-XXXX.md where XXXX is 4-digit ID
+                filename = os.path.basename(opened_path)
+                self.assertTrue(_FILENAME_RE.match(filename),
+                               f"Filename {filename} doesn't match expected pattern")
+                for substring in expected:
+                    self.assertIn(substring, content)
+                for substring in forbidden:
+                    self.assertNotIn(substring, content)
 
-            self.assertTrue(os.path.exists(file_path))
-            with open(file_path, "r") as f:
-                content = f.read()
-                # Check that whitespace is trimmed inside parentheses
-                self.assertIn("- 1 tbsp ginger (chopped or minced)", content)
-                self.assertIn("- ½ tbsp garlic (chopped or minced)", content)
-                self.assertIn("- 1 cup flour (normal)", content)
-                # Ensure trailing/leading spaces are not present
-                self.assertNotIn("(chopped or minced )", content)
-                self.assertNotIn("( normal )", content)
-
-    @patch('builtins.open', new_callable=mock_open, read_data="# Test Recipe\n**Serves:** 4 servings\n**Total Time:** 30 mins\n\n## Ingredients\n- 1 cup flour\n- 2 eggs\n\n## Instructions\n1. Mix ingredients\n2. Bake for 20 minutes")
+    @patch('builtins.open', new=_open_stringio(RECIPE_MD))
     @patch('os.path.exists', return_value=True)
-    def test_view_recipe(self, mock_exists, mock_open):
-        settings = {"directory": tempfile.gettempdir(), "yield": True, "time": True}
+    def test_view_recipe(self, mock_exists, mock_scrape_me):
+        mock_scrape_me.return_value = _mock_scraper()
+        settings = {"directory": _TMP, "yield": True, "time": True}
         recipe_url = "http://example.com/recipe"
         with patch('inquirer.prompt', return_value={"after_view": "Quit"}):
             view_recipe(recipe_url, settings, prompt_save=False)
 
-    @patch('pure_recipe.scrape_me')
     def test_save_list_of_recipes(self, mock_scrape_me):
-        mock_scraper = MagicMock()
-        mock_scraper.title.return_value = "Test Recipe"
-        mock_scraper.yields.return_value = "4 servings"
-        mock_scraper.total_time.return_value = 30
-        mock_scraper.ingredients.return_value = ["1 cup flour", "2 eggs"]
-        mock_scraper.instructions_list.return_value = ["Mix ingredients", "Bake for 20 minutes"]
-        mock_scrape_me.return_value = mock_scraper
+        mock_scrape_me.return_value = _mock_scraper()
 
         # Use a real temporary directory for actual file operations
-        with tempfile.TemporaryDirectory() as tmpdir:
-            settings = {"directory": tmpdir, "yield": True, "time": True}
-            url_file = os.path.join(tmpdir, "urls.txt")
-            with open(url_file, "w") as f:
-                f.write("http://example.com/recipe1\nhttp://example.com/recipe2")
-
-            save_list_of_recipes(url_file, settings)
-
-            # Check that files were created with correct pattern
-            files_created = [f for f in os.listdir(tmpdir) 
-                            if f.startswith("test-recipe-") and f.endswith(".md")]
-            self.assertEqual(len(files_created), 2, "Expected 2 recipe files to be created")
-            
-            for filename in files_created:
-                # Verify filename pattern: test-recipe-XXXX.md
-                self.assertTrue(re.match(r"test-recipe-\d{4}\.md", filename),
-                               f"Filename {filename} doesn't match expected pattern")
-                file_path = os.path.join(tmpdir, filename)
-                with open(file_path, "r") as f:
-                    content = f.read()
-                    self.assertIn("# Test Recipe", content)  # Clean title without dashes
-                    self.assertIn("**Serves:** 4 servings", content)
-                    self.assertIn("**Total Time:** 30 mins", content)
-                    self.assertIn("- 1 cup flour", content)
-                    self.assertIn("1. Mix ingredients", content)
+        tmpdir = self._make_tmpdir()
+        settings = {"directory": tmpdir, "yield": True, "time": True}
+        url_file = os.path.join(tmpdir, "urls.txt")
+        with open(url_file, "w") as f:
+            f.write("http://example.com/recipe1\nhttp://example.com/recipe2")
+
+        save_list_of_recipes(url_file, settings)
+
+        # Check that files were created with correct pattern
+        files_created = sorted(f for f in os.listdir(tmpdir) if f.startswith("test-recipe-"))
+        self.assertEqual(len(files_created), 2, "Expected 2 recipe files to be created")
+
+        for filename in files_created:
+            # Verify filename pattern: test-recipe-XXXX.md
+            self.assertTrue(_FILENAME_RE.match(filename),
+                           f"Filename {filename} doesn't match expected pattern")
+
+        # Every URL is served by the same mock scraper, so one file is representative
+        with open(os.path.join(tmpdir, files_created[0]), "r") as f:
+            content = f.read()
+        self.assertIn("# Test Recipe", content)  # Clean title without dashes
+        self.assertIn("**Serves:** 4 servings", content)
+        self.assertIn("**Total Time:** 30 mins", content)
+        self.assertIn("- 1 cup flour", content)
+        self.assertIn("1. Mix ingredients", content)
 
     @patch('os.listdir', return_value=["test-recipe.md"])
-    @patch('builtins.open', new_callable=mock_open, read_data="# Test Recipe\n**Serves:** 4 servings\n**Total Time:** 30 mins\n\n## Ingredients\n- 1 cup flour\n- 2 eggs\n\n## Instructions\n1. Mix ingredients\n2. Bake for 20 minutes")
+    @patch('builtins.open', new=_open_stringio(RECIPE_MD))
     @patch('os.path.exists', return_value=True)
-    def test_browse_recipes(self, mock_exists, mock_open, mock_listdir):
-        settings = {"directory": tempfile.gettempdir()}
+    def test_browse_recipes(self, mock_exists, mock_listdir, mock_scrape_me):
+        settings = {"directory": _TMP}
         with patch('inquirer.prompt', side_effect=[{"recipe": "Test Recipe"}, {"back_to_menu": "Quit"}]):
             browse_recipes(settings)
 
     @patch('os.makedirs')
     @patch('os.path.exists', return_value=False)
-    @patch('yaml.safe_load', return_value={"directory": tempfile.gettempdir(), "time": True, "yield": True})
-    def test_load_yaml(self, mock_safe_load, mock_exists, mock_makedirs):
+    @patch('yaml.safe_load', return_value={"directory": _TMP, "time": True, "yield": True})
+    def test_load_yaml(self, mock_safe_load, mock_exists, mock_makedirs, mock_scrape_me):
         settings = load_yaml()
         self.assertIn("directory", settings)
         self.assertIn("time", settings)
         self.assertIn("yield", settings)
 
     @patch('argparse.ArgumentParser.parse_args', return_value=argparse.Namespace(operations="view", url="http://example.com/recipe"))
-    def test_parse_arguments(self, mock_parse_args):
+    def test_parse_arguments(self, mock_parse_args, mock_scrape_me):
         args = parse_arguments()
         self.assertEqual(args.operations, "view")
         self.assertEqual(args.url, "http://example.com/recipe")